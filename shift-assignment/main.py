@@ -6,6 +6,8 @@ import logging
 import sys
 from typing import Any
 
+import numpy as np
+import orjson
 import pyomo.environ as pyo
 
 logging.getLogger("pyomo.core").setLevel(logging.ERROR)
@@ -88,26 +90,36 @@ def solve(
     # Prepare data
     workers, shifts, rules_per_worker = convert_input(input_data)
 
+    # >>> Sets and parameters
+
+    model.W = pyo.Set(initialize=[worker["id"] for worker in workers])
+    model.S = pyo.Set(initialize=[shift["id"] for shift in shifts])
+    model.shift_demand = pyo.Param(
+        model.S,
+        initialize={shift["id"]: shift["count"] for shift in shifts},
+    )
+    model.min_shifts = pyo.Param(
+        model.W,
+        initialize={w: rules["min_shifts"] for w, rules in rules_per_worker.items()},
+    )
+    model.max_shifts = pyo.Param(
+        model.W,
+        initialize={w: rules["max_shifts"] for w, rules in rules_per_worker.items()},
+    )
+
     # >>> Variables
 
     # Create binary variables indicating whether a worker is assigned to a shift
-    model.x_assign = pyo.Var(
-        [(worker["id"], shift["id"]) for worker in workers for shift in shifts],
-        within=pyo.Binary,
-    )
+    model.x_assign = pyo.Var(model.W, model.S, within=pyo.Binary)
 
     # Create binary variable indicating whether a worker has an assignment.
-    model.y_worker = pyo.Var(
-        [(worker["id"]) for worker in workers],
-        within=pyo.Binary,
-    )
+    model.y_worker = pyo.Var(model.W, within=pyo.Binary)
 
     # >>> Objective
 
     # Minimize the number of workers with assignments.
-    preferences = sum(model.y_worker[(worker["id"])] for worker in workers)
     model.objective = pyo.Objective(
-        expr=preferences,
+        expr=sum(model.y_worker[w] for w in model.W),
         sense=pyo.minimize,
     )
 
@@ -116,91 +128,65 @@ def solve(
     # Relationship between x_assign and y_worker. If a worker is assigned to at
     # least one shift, then y_worker is 1. On the other hand, if a worker is
     # not assigned to any shift, then y_worker is 0.
-    for worker in workers:
-        shifts_assigned = sum(
-            model.x_assign[(worker["id"], shift["id"])] for shift in shifts
-        )
-        model.add_component(
-            f"worker_{worker['id']}_no_shifts",
-            pyo.Constraint(
-                expr=shifts_assigned <= model.y_worker[(worker["id"])] * len(shifts)
-            ),
-        )
-        model.add_component(
-            f"worker_{worker['id']}_at_least_one_shift",
-            pyo.Constraint(expr=shifts_assigned >= model.y_worker[(worker["id"])]),
-        )
+    def worker_no_shifts_rule(m, w):
+        return sum(m.x_assign[w, s] for s in m.S) <= m.y_worker[w] * len(m.S)
 
-    # Each shift must have the required number of workers.
-    for shift in shifts:
-        num_workers = sum(model.x_assign[(e["id"], shift["id"])] for e in workers)
-        model.add_component(
-            f"shift_{shift['id']}_count",
-            pyo.Constraint(expr=num_workers == shift["count"]),
-        )
+    def worker_at_least_one_shift_rule(m, w):
+        return sum(m.x_assign[w, s] for s in m.S) >= m.y_worker[w]
 
-    # Each worker must be assigned the minimum and maximum number of shifts.
-    for worker in workers:
-        rules = rules_per_worker[worker["id"]]
-        num_shifts = sum(model.x_assign[(worker["id"], s["id"])] for s in shifts)
-        model.add_component(
-            f"worker_{worker['id']}_min",
-            pyo.Constraint(expr=num_shifts >= rules["min_shifts"]),
-        )
-        model.add_component(
-            f"worker_{worker['id']}_max",
-            pyo.Constraint(expr=num_shifts <= rules["max_shifts"]),
-        )
+    model.worker_no_shifts = pyo.Constraint(model.W, rule=worker_no_shifts_rule)
+    model.worker_at_least_one_shift = pyo.Constraint(
+        model.W, rule=worker_at_least_one_shift_rule
+    )
 
-    # Ensure that the minimum rest time between shifts is respected.
-    for worker in workers:
-        rest_time = datetime.timedelta(
-            hours=rules_per_worker[worker["id"]]["min_rest_hours_between_shifts"]
-        )
-        for s1, shift1 in enumerate(shifts):
-            for s2, shift2 in enumerate(shifts):
-                if s1 >= s2:
-                    continue
-
-                if (
-                    shift1["end_time"] + rest_time < shift2["start_time"]
-                    or shift2["end_time"] + rest_time < shift1["start_time"]
-                ):
-                    continue
-
-                # The two shifts are closer to each other than the minimum rest
-                # time, so we need to ensure that the worker is not assigned to
-                # both.
-                assignment_1 = model.x_assign[(worker["id"], shift1["id"])]
-                assignment_2 = model.x_assign[(worker["id"], shift2["id"])]
-                expression = assignment_1 + assignment_2 <= 1
-                model.add_component(
-                    f"Rest_{worker['id']}_{shift1['id']}_{shift2['id']}",
-                    pyo.Constraint(expr=expression),
-                )
+    # Each shift must have the required number of workers.
+    def shift_count_rule(m, s):
+        return sum(m.x_assign[w, s] for w in m.W) == m.shift_demand[s]
 
-    # Ensure that availabilities are respected.
-    for worker in workers:
-        for shift in shifts:
-            if not any(
-                availability["start_time"] <= shift["start_time"]
-                and availability["end_time"] >= shift["end_time"]
-                for availability in worker["availability"]
-            ):
-                model.x_assign[(worker["id"], shift["id"])].fix(0)
+    model.shift_count = pyo.Constraint(model.S, rule=shift_count_rule)
 
-    # Ensure that workers are qualified for the shift.
+    # Each worker must be assigned the minimum and maximum number of shifts.
+    def worker_min_rule(m, w):
+        return sum(m.x_assign[w, s] for s in m.S) >= m.min_shifts[w]
+
+    def worker_max_rule(m, w):
+        return sum(m.x_assign[w, s] for s in m.S) <= m.max_shifts[w]
+
+    model.worker_min = pyo.Constraint(model.W, rule=worker_min_rule)
+    model.worker_max = pyo.Constraint(model.W, rule=worker_max_rule)
+
+    # Ensure that the minimum rest time between shifts is respected. The pairs
+    # of conflicting shifts only depend on the rest time, so they are computed
+    # once for every distinct rest time.
+    reference = shifts[0]["start_time"] if shifts else None
+    shift_starts = seconds_from([shift["start_time"] for shift in shifts], reference)
+    shift_ends = seconds_from([shift["end_time"] for shift in shifts], reference)
+    conflicts_per_rest_hours = {}
+    model.rest = pyo.ConstraintList()
     for worker in workers:
-        for shift in shifts:
-            if "qualification" not in shift or shift["qualification"] == "":
-                continue
-
-            if "qualifications" not in worker:
-                model.x_assign[(worker["id"], shift["id"])].fix(0)
-                continue
-
-            if shift["qualification"] not in worker["qualifications"]:
-                model.x_assign[(worker["id"], shift["id"])].fix(0)
+        rest_hours = rules_per_worker[worker["id"]]["min_rest_hours_between_shifts"]
+        if rest_hours not in conflicts_per_rest_hours:
+            conflicts_per_rest_hours[rest_hours] = conflicting_shifts(
+                shift_starts, shift_ends, rest_hours * 3600
+            )
+
+        for s1, s2 in conflicts_per_rest_hours[rest_hours]:
+            shift1 = shifts[s1]
+            shift2 = shifts[s2]
+
+            # The two shifts are closer to each other than the minimum rest
+            # time, so we need to ensure that the worker is not assigned to
+            # both.
+            assignment_1 = model.x_assign[(worker["id"], shift1["id"])]
+            assignment_2 = model.x_assign[(worker["id"], shift2["id"])]
+            model.rest.add(assignment_1 + assignment_2 <= 1)
+
+    # Ensure that availabilities and qualifications are respected. Every
+    # assignment that is not possible is fixed to 0, exactly once.
+    assignable = assignable_shifts(workers, shifts)
+    for w, s in np.argwhere(~assignable):
+        model.x_assign[(workers[w]["id"], shifts[s]["id"])].fix(0)
+    fixed_vars = int((~assignable).sum())
 
     # Solve the model.
     results = solver.solve(model)
@@ -208,7 +194,6 @@ def solve(
     # Parse solution.
     value = pyo.value(model.objective, exception=False)
     assigned_shifts = []
-    fixed_vars = 0
     availabilities_used = 0
     total_availabilities = 0
     for worker in workers:
@@ -233,9 +218,6 @@ def solve(
                         availabilities_used += 1
                         worker_availabilities.remove(availability)
 
-            if assignment.is_fixed():
-                fixed_vars += 1
-
     active_workers = len(set(shift["worker_id"] for shift in assigned_shifts))
     total_workers = len(workers)
 
@@ -321,11 +303,68 @@ def convert_input(input_data: dict[str, Any]) -> tuple[list, list, dict]:
     return workers, shifts, rules_per_worker
 
 
-def custom_serial(obj):
-    """JSON serializer for objects not serializable by default serializer."""
-    if isinstance(obj, (datetime.datetime | datetime.date)):
-        return obj.isoformat()
-    raise TypeError("Type %s not serializable" % type(obj))
+def assignable_shifts(workers: list, shifts: list) -> np.ndarray:
+    """Returns a (workers x shifts) boolean mask of the shifts each worker can
+    be assigned to: one of the worker's availabilities covers the shift
+    entirely and the worker has the qualification the shift requires (if
+    any)."""
+    reference = shifts[0]["start_time"] if shifts else None
+    shift_starts = seconds_from([shift["start_time"] for shift in shifts], reference)
+    shift_ends = seconds_from([shift["end_time"] for shift in shifts], reference)
+    required = list(
+        dict.fromkeys(
+            shift["qualification"]
+            for shift in shifts
+            if shift.get("qualification", "") != ""
+        )
+    )
+    requires = np.array(
+        [[shift.get("qualification") == q for q in required] for shift in shifts],
+        dtype=bool,
+    ).reshape(len(shifts), len(required))
+
+    assignable = np.empty((len(workers), len(shifts)), dtype=bool)
+    for w, worker in enumerate(workers):
+        availability_starts = seconds_from(
+            [a["start_time"] for a in worker["availability"]], reference
+        )
+        availability_ends = seconds_from(
+            [a["end_time"] for a in worker["availability"]], reference
+        )
+        available = (
+            (availability_starts[None, :] <= shift_starts[:, None])
+            & (availability_ends[None, :] >= shift_ends[:, None])
+        ).any(axis=1)
+        qualifications = worker.get("qualifications", [])
+        has_required = np.array([q in qualifications for q in required], dtype=bool)
+        qualified = ~(requires & ~has_required[None, :]).any(axis=1)
+        assignable[w] = available & qualified
+
+    return assignable
+
+
+def conflicting_shifts(
+    starts: np.ndarray,
+    ends: np.ndarray,
+    rest_seconds: float,
+) -> list[list[int]]:
+    """Returns the index pairs (s1 < s2) of shifts that are closer to each
+    other than the given rest time. Times are given in seconds."""
+    conflicts = (ends[:, None] + rest_seconds >= starts[None, :]) & (
+        ends[None, :] + rest_seconds >= starts[:, None]
+    )
+    return np.argwhere(np.triu(conflicts, k=1)).tolist()
+
+
+def seconds_from(
+    times: list[datetime.datetime],
+    reference: datetime.datetime,
+) -> np.ndarray:
+    """Returns the times as seconds relative to the reference. Unlike
+    timestamp(), this keeps comparing naive datetimes by their wall-clock
+    time and raises a TypeError when naive and aware datetimes are mixed,
+    just like comparing the datetimes directly."""
+    return np.array([(t - reference).total_seconds() for t in times], dtype=float)
 
 
 def log(message: str) -> None:
@@ -346,12 +385,13 @@ def read_input(input_path) -> dict[str, Any]:
 
 def write_output(output_path, output) -> None:
     """Writes the output to stdout or a given output file."""
-    content = json.dumps(output, indent=2, default=custom_serial)
+    # orjson serializes datetimes natively (RFC 3339, same as isoformat).
+    content = orjson.dumps(output, option=orjson.OPT_INDENT_2) + b"\n"
     if output_path:
-        with open(output_path, "w", encoding="utf-8") as file:
-            file.write(content + "\n")
+        with open(output_path, "wb") as file:
+            file.write(content)
     else:
-        print(content)
+        sys.stdout.buffer.write(content)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,157 @@
+import datetime
+
+import numpy as np
+import pytest
+
+from main import assignable_shifts, conflicting_shifts, seconds_from
+
+HOUR = 3600
+BASE = datetime.datetime(2023, 11, 20, tzinfo=datetime.timezone.utc)
+
+
+def _times(*hours: float) -> np.ndarray:
+    return np.array(hours, dtype=float) * HOUR
+
+
+def _at(hours: float) -> datetime.datetime:
+    return BASE + datetime.timedelta(hours=hours)
+
+
+def _shift(id: str, start: float, end: float, **kwargs) -> dict:
+    return {"id": id, "start_time": _at(start), "end_time": _at(end), **kwargs}
+
+
+def _worker(id: str, windows: list[tuple[float, float]], **kwargs) -> dict:
+    return {
+        "id": id,
+        "availability": [
+            {"start_time": _at(start), "end_time": _at(end)} for start, end in windows
+        ],
+        **kwargs,
+    }
+
+
+def test_seconds_from_naive_across_dst():
+    # Naive times are compared by wall-clock time, so the night of a DST change
+    # (e.g. 2023-03-26 in Europe) still spans 11 hours between 22:00 and 9:00.
+    reference = datetime.datetime(2023, 3, 25, 22)
+    times = [datetime.datetime(2023, 3, 26, 9)]
+    assert seconds_from(times, reference).tolist() == [11 * HOUR]
+
+
+def test_seconds_from_mixed_naive_and_aware():
+    with pytest.raises(TypeError):
+        seconds_from([datetime.datetime(2023, 11, 20, 6)], BASE)
+
+
+def test_conflicting_shifts_boundary():
+    # Shift 0 ends at 8, shift 1 starts exactly 11 hours later and shift 2
+    # one second after that.
+    starts = np.array([0, 19 * HOUR, 19 * HOUR + 1], dtype=float)
+    ends = np.array([8 * HOUR, 27 * HOUR, 27 * HOUR + 1], dtype=float)
+
+    conflicts = conflicting_shifts(starts, ends, 11 * HOUR)
+
+    # end + rest == start is a conflict, one second more is not.
+    assert [0, 1] in conflicts
+    assert [0, 2] not in conflicts
+    # Overlapping shifts always conflict.
+    assert [1, 2] in conflicts
+
+
+def test_conflicting_shifts_mixed_rest_hours():
+    # Early (6-14), late (14-22) and next early (30-38) shifts.
+    starts = _times(6, 14, 30)
+    ends = _times(14, 22, 38)
+
+    assert conflicting_shifts(starts, ends, 0) == [[0, 1]]
+    assert conflicting_shifts(starts, ends, 8 * HOUR) == [[0, 1], [1, 2]]
+    assert conflicting_shifts(starts, ends, 16 * HOUR) == [[0, 1], [0, 2], [1, 2]]
+
+
+def test_conflicting_shifts_matches_pairwise_rule():
+    rng = np.random.default_rng(7)
+    starts = np.sort(rng.integers(0, 7 * 24, size=40)).astype(float) * HOUR
+    ends = starts + rng.integers(4, 12, size=40) * HOUR
+    for rest_hours in [0, 8, 11]:
+        rest = datetime.timedelta(hours=rest_hours)
+        expected = []
+        for s1 in range(len(starts)):
+            for s2 in range(s1 + 1, len(starts)):
+                start1 = BASE + datetime.timedelta(seconds=starts[s1])
+                end1 = BASE + datetime.timedelta(seconds=ends[s1])
+                start2 = BASE + datetime.timedelta(seconds=starts[s2])
+                end2 = BASE + datetime.timedelta(seconds=ends[s2])
+                if end1 + rest < start2 or end2 + rest < start1:
+                    continue
+                expected.append([s1, s2])
+
+        assert conflicting_shifts(starts, ends, rest_hours * HOUR) == expected
+
+
+def test_assignable_shifts_availability():
+    shifts = [_shift("early", 6, 14), _shift("late", 14, 22), _shift("night", 22, 30)]
+    workers = [
+        # Covers early exactly and late only partially.
+        _worker("w1", [(6, 14), (15, 22)]),
+        # Covers everything with a single availability.
+        _worker("w2", [(0, 30)]),
+        # No availability at all.
+        _worker("w3", []),
+    ]
+
+    assignable = assignable_shifts(workers, shifts)
+
+    assert assignable.tolist() == [
+        [True, False, False],
+        [True, True, True],
+        [False, False, False],
+    ]
+
+
+def test_assignable_shifts_qualifications():
+    shifts = [
+        _shift("any", 6, 14),
+        _shift("empty", 6, 14, qualification=""),
+        _shift("dairy", 6, 14, qualification="dairy"),
+        _shift("normal", 6, 14, qualification="normal"),
+    ]
+    workers = [
+        _worker("dairy", [(0, 24)], qualifications=["dairy"]),
+        _worker("both", [(0, 24)], qualifications=["normal", "dairy"]),
+        _worker("none", [(0, 24)], qualifications=[]),
+        _worker("missing", [(0, 24)]),
+        # Qualified, but not available.
+        _worker("away", [(14, 24)], qualifications=["dairy"]),
+    ]
+
+    assignable = assignable_shifts(workers, shifts)
+
+    assert assignable.tolist() == [
+        [True, True, True, False],
+        [True, True, True, True],
+        [True, True, False, False],
+        [True, True, False, False],
+        [False, False, False, False],
+    ]
+
+
+def test_assignable_shifts_mixed_naive_and_aware():
+    shifts = [_shift("early", 6, 14)]
+    workers = [_worker("w1", [])]
+    workers[0]["availability"] = [
+        {
+            "start_time": datetime.datetime(2023, 11, 20, 0),
+            "end_time": datetime.datetime(2023, 11, 21, 0),
+        }
+    ]
+
+    with pytest.raises(TypeError):
+        assignable_shifts(workers, shifts)
+
+
+def test_assignable_shifts_no_required_qualifications():
+    shifts = [_shift("early", 6, 14), _shift("late", 14, 22)]
+    workers = [_worker("w1", [(0, 14)])]
+
+    assert assignable_shifts(workers, shifts).tolist() == [[True, False]]
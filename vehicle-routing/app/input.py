@@ -2,11 +2,13 @@
 
 import json
 import sys
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from typing import Any, Dict
 
+import numpy as np
 
-@dataclass
+
+@dataclass(slots=True)
 class Location:
     """A location on the map."""
 
@@ -25,8 +27,12 @@ class Location:
             lat=obj["lat"],
         )
 
+    def to_dict(self) -> Dict[str, Any]:
+        """Converts the location to a dictionary."""
+        return {"lon": self.lon, "lat": self.lat}
+
 
-@dataclass
+@dataclass(slots=True)
 class Stop:
     """A stop corresponding to a customer request."""
 
@@ -41,8 +47,12 @@ class Stop:
             location=Location.from_dict(obj["location"]),
         )
 
+    def to_dict(self) -> Dict[str, Any]:
+        """Converts the stop to a dictionary."""
+        return {"id": self.id, "location": self.location.to_dict()}
+
 
-@dataclass
+@dataclass(slots=True)
 class Vehicle:
     """A vehicle that can service stops."""
 
@@ -58,40 +68,35 @@ class Vehicle:
         )
 
 
-@dataclass
+@dataclass(slots=True)
 class Input:
     """The input data."""
 
     depot: Stop
     vehicles: list[Vehicle]
     stops: list[Stop]
-    stops_by_index: Dict[int, Stop] = None
-    vehicles_by_index: Dict[int, Vehicle] = None
+    # Coordinates of the depot (first) and the stops as contiguous arrays.
+    lats: np.ndarray = field(init=False, repr=False, compare=False)
+    lons: np.ndarray = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self):
+        """Derives the coordinate arrays from the depot and the stops."""
+        locations = [self.depot.location] + [stop.location for stop in self.stops]
+        count = len(locations)
+        self.lats = np.fromiter((loc.lat for loc in locations), dtype=np.float64, count=count)
+        self.lons = np.fromiter((loc.lon for loc in locations), dtype=np.float64, count=count)
 
     @classmethod
     def from_dict(cls, obj: Dict[str, Any]):
         """Parses the input from a dictionary."""
 
-        stops_by_index = {}
-        stops = []
-        for ix, stop_obj in enumerate(obj["stops"]):
-            stop = Stop.from_dict(stop_obj)
-            stops.append(stop)
-            stops_by_index[ix] = stop
-
-        vehicles_by_index = {}
-        vehicles = []
-        for ix, vehicle_obj in enumerate(obj["vehicles"]):
-            vehicle = Vehicle.from_dict(vehicle_obj)
-            vehicles.append(vehicle)
-            vehicles_by_index[ix] = vehicle
+        stops = [Stop.from_dict(stop_obj) for stop_obj in obj["stops"]]
+        vehicles = [Vehicle.from_dict(vehicle_obj) for vehicle_obj in obj["vehicles"]]
 
         return cls(
             depot=Stop.from_dict(obj["depot"]),
             vehicles=vehicles,
             stops=stops,
-            stops_by_index=stops_by_index,
-            vehicles_by_index=vehicles_by_index,
         )
 
     @classmethod
@@ -112,4 +117,4 @@ class Input:
         if index == 0:
             return self.depot
 
-        return self.stops_by_index[index - 1]
+        return self.stops[index - 1]
@@ -1,10 +1,11 @@
 """Output data for the application."""
 
-import json
 import math
-from dataclasses import asdict, dataclass
-from typing import List, Tuple
+import sys
+from dataclasses import dataclass
+from typing import Any, Dict, List, Tuple
 
+import orjson
 from ortools.constraint_solver import pywrapcp
 
 from app.input import Input
@@ -12,7 +13,7 @@ from app.input import Stop as InputStop
 from app.input import Vehicle as InputVehicle
 
 
-@dataclass
+@dataclass(slots=True)
 class Custom:
     """The custom statistics."""
 
@@ -22,8 +23,18 @@ class Custom:
     max_stops_in_vehicle: int
     min_stops_in_vehicle: int
 
+    def to_dict(self) -> Dict[str, Any]:
+        """Converts the custom statistics to a dictionary."""
+        return {
+            "activated_vehicles": self.activated_vehicles,
+            "max_travel_duration": self.max_travel_duration,
+            "min_travel_duration": self.min_travel_duration,
+            "max_stops_in_vehicle": self.max_stops_in_vehicle,
+            "min_stops_in_vehicle": self.min_stops_in_vehicle,
+        }
 
-@dataclass
+
+@dataclass(slots=True)
 class Result:
     """The result statistics."""
 
@@ -31,15 +42,27 @@ class Result:
     duration: float
     value: float
 
+    def to_dict(self) -> Dict[str, Any]:
+        """Converts the result statistics to a dictionary."""
+        return {
+            "custom": self.custom.to_dict(),
+            "duration": self.duration,
+            "value": self.value,
+        }
+
 
-@dataclass
+@dataclass(slots=True)
 class Run:
     """The run statistics."""
 
     duration: float
 
+    def to_dict(self) -> Dict[str, Any]:
+        """Converts the run statistics to a dictionary."""
+        return {"duration": self.duration}
+
 
-@dataclass
+@dataclass(slots=True)
 class Statistics:
     """The statistics of the run."""
 
@@ -47,16 +70,31 @@ class Statistics:
     run: Run
     schema: str
 
+    def to_dict(self) -> Dict[str, Any]:
+        """Converts the statistics to a dictionary."""
+        return {
+            "result": self.result.to_dict(),
+            "run": self.run.to_dict(),
+            "schema": self.schema,
+        }
 
-@dataclass
+
+@dataclass(slots=True)
 class Stop:
     """The stop in a route."""
 
     stop: InputStop
     cumulative_travel_duration: float
 
+    def to_dict(self) -> Dict[str, Any]:
+        """Converts the stop to a dictionary."""
+        return {
+            "stop": self.stop.to_dict(),
+            "cumulative_travel_duration": self.cumulative_travel_duration,
+        }
+
 
-@dataclass
+@dataclass(slots=True)
 class Vehicle:
     """The vehicle of the output."""
 
@@ -64,20 +102,35 @@ class Vehicle:
     route: List[Stop]
     route_travel_duration: float
 
+    def to_dict(self) -> Dict[str, Any]:
+        """Converts the vehicle to a dictionary."""
+        return {
+            "id": self.id,
+            "route": [stop.to_dict() for stop in self.route],
+            "route_travel_duration": self.route_travel_duration,
+        }
 
-@dataclass
+
+@dataclass(slots=True)
 class Solution:
     """The solution of the problem."""
 
     unplanned: List[InputStop]
     vehicles: List[Vehicle]
 
+    def to_dict(self) -> Dict[str, Any]:
+        """Converts the solution to a dictionary."""
+        return {
+            "unplanned": [stop.to_dict() for stop in self.unplanned],
+            "vehicles": [vehicle.to_dict() for vehicle in self.vehicles],
+        }
+
 
 def _build_vehicle(
     solution,
     travel_dimension: pywrapcp.RoutingDimension,
     model: pywrapcp.RoutingModel,
-    manager: pywrapcp.RoutingIndexManager,
+    node_by_index: List[int],
     vehicle: InputVehicle,
     vehicle_ix: int,
     input_data: Input,
@@ -85,23 +138,27 @@ def _build_vehicle(
     """Builds a vehicle from the solution and returns the vehicle and its
     travel duration."""
 
+    # Bind the methods used for every visited index to locals.
+    get_stop = input_data.get_stop_by_index
+    cumul_var = travel_dimension.CumulVar
+    next_var = model.NextVar
+    is_end = model.IsEnd
+    solution_min = solution.Min
+    solution_value = solution.Value
+
     index = model.Start(vehicle_ix)
     route = []
-    while not model.IsEnd(index):
-        stop = input_data.get_stop_by_index(index=manager.IndexToNode(index))
-        travel_duration_var = travel_dimension.CumulVar(index)
+    while not is_end(index):
         output_stop = Stop(
-            stop=stop,
-            cumulative_travel_duration=solution.Min(travel_duration_var),
+            stop=get_stop(node_by_index[index]),
+            cumulative_travel_duration=solution_min(cumul_var(index)),
         )
         route.append(output_stop)
-        index = solution.Value(model.NextVar(index))
+        index = solution_value(next_var(index))
 
-    stop = input_data.get_stop_by_index(index=manager.IndexToNode(index))
-    travel_duration_var = travel_dimension.CumulVar(index)
     output_stop = Stop(
-        stop=stop,
-        cumulative_travel_duration=solution.Min(travel_duration_var),
+        stop=get_stop(node_by_index[index]),
+        cumulative_travel_duration=solution_min(cumul_var(index)),
     )
     route.append(output_stop)
     output_vehicle = Vehicle(
@@ -113,21 +170,28 @@ def _build_vehicle(
     return output_vehicle, output_stop.cumulative_travel_duration
 
 
-@dataclass
+@dataclass(slots=True)
 class Output:
     """The output with the result."""
 
     solutions: list[Solution]
     statistics: Statistics
 
+    def to_dict(self) -> Dict[str, Any]:
+        """Converts the output to a dictionary."""
+        return {
+            "solutions": [solution.to_dict() for solution in self.solutions],
+            "statistics": self.statistics.to_dict(),
+        }
+
     def write(self, output_path: str) -> None:
         """Writes the output to stdout or a given output file."""
-        content = json.dumps(asdict(self), indent=2)
+        content = orjson.dumps(self.to_dict(), option=orjson.OPT_INDENT_2) + b"\n"
         if output_path != "":
-            with open(output_path, "w", encoding="utf-8") as file:
-                file.write(content + "\n")
+            with open(output_path, "wb") as file:
+                file.write(content)
         else:
-            print(content)
+            sys.stdout.buffer.write(content)
 
     @classmethod
     def from_solution(
@@ -139,13 +203,22 @@ class Output:
     ):
         """Builds the class from the solution."""
 
-        unplanned_stops = []
-        for node in range(model.Size()):
-            if model.IsStart(node) or model.IsEnd(node):
-                continue
-            if solution.Value(model.NextVar(node)) == node:
-                index = manager.IndexToNode(node)
-                unplanned_stops.append(input_data.get_stop_by_index(index))
+        # Resolve the node of every routing index once, instead of calling
+        # into the manager for each visited index.
+        node_by_index = [
+            manager.IndexToNode(index) for index in range(manager.GetNumberOfIndices())
+        ]
+
+        # With the depot as node 0, the stops are the routing indices 1..N, in
+        # the same order as in the input. A stop is unplanned if its next
+        # variable points to itself.
+        next_var = model.NextVar
+        solution_value = solution.Value
+        unplanned_stops = [
+            stop
+            for index, stop in enumerate(input_data.stops, start=1)
+            if solution_value(next_var(index)) == index
+        ]
 
         output_vehicles = []
         activated_vehicles = 0
@@ -159,7 +232,7 @@ class Output:
                 solution=solution,
                 travel_dimension=travel_dimension,
                 model=model,
-                manager=manager,
+                node_by_index=node_by_index,
                 vehicle=vehicle,
                 vehicle_ix=vehicle_ix,
                 input_data=input_data,
@@ -174,6 +247,13 @@ class Output:
                 max_stops_in_vehicle = max(max_stops_in_vehicle, len(route) - 2)
                 min_stops_in_vehicle = min(min_stops_in_vehicle, len(route) - 2)
 
+        # Without activated vehicles there are no routes. Report 0 for the
+        # minimums, as for the maximums, instead of their initial values (a
+        # non-finite one cannot be represented in JSON).
+        if activated_vehicles == 0:
+            min_travel_duration = 0
+            min_stops_in_vehicle = 0
+
         duration = solution.solver().WallTime() / 1000
         statistics = Statistics(
             result=Result(
@@ -63,7 +63,13 @@ def solve(input_data: Input, args: argparse.Namespace) -> Output:
         len(input_data.vehicles),
         0,
     )
-    model = pywrapcp.RoutingModel(manager)
+    # Let OR-Tools cache the transit callbacks (a table of int64 values for
+    # every pair of indices, per callback) for models of up to 1000 nodes, and
+    # collapse vehicles that share the same cost structure.
+    model_parameters = pywrapcp.DefaultRoutingModelParameters()
+    model_parameters.max_callback_cache_size = 1000
+    model_parameters.reduce_vehicle_cost_model = True
+    model = pywrapcp.RoutingModel(manager, model_parameters)
 
     # Add features to the model.
     add_travel_duration_dimension(
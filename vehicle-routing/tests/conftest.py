@@ -0,0 +1,5 @@
+import pathlib
+import sys
+
+# Make the app package importable regardless of how pytest is invoked.
+sys.path.insert(0, str(pathlib.Path(__file__).parent.parent.resolve()))
@@ -129,7 +129,19 @@ def test_sample_input():
     _run_test(test)
 
 
+def test_no_activated_vehicles():
+    test = AppTest(
+        "no-activated-vehicles",
+        ["-unplanned.penalty", "0"],
+        os.path.join(DATA_DIR, "input.json"),
+        os.path.join(OUTPUT_DIR, "input.no-activated-vehicles.output.json"),
+        os.path.join(DATA_DIR, "input.no-activated-vehicles.json.golden"),
+    )
+    _run_test(test)
+
+
 if __name__ == "__main__":
     run_around_tests()
     test_sample_input()
+    test_no_activated_vehicles()
     print("Everything passed")
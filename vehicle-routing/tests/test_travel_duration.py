@@ -0,0 +1,70 @@
+import numpy as np
+import pytest
+
+from app.input import Input, Location, Stop
+from app.travel_duration import FLOAT32_MAX_EXTENT, distance_matrix
+
+# Maximum absolute error (in meters) tolerated against the float64 reference.
+TOLERANCE = 1.0
+
+
+def _random_input(lat: float, lon: float, extent: float, num_stops: int = 300) -> Input:
+    """Creates an input with stops spread uniformly around the given center."""
+    rng = np.random.default_rng(42)
+    lats = np.clip(lat + (rng.random(num_stops + 1) - 0.5) * extent, -89.9, 89.9)
+    lons = lon + (rng.random(num_stops + 1) - 0.5) * extent
+    locations = [{"lat": float(la), "lon": float(lo)} for la, lo in zip(lats, lons)]
+    stops = [{"id": f"s{i}", "location": loc} for i, loc in enumerate(locations[1:])]
+    return Input.from_dict(
+        {
+            "depot": {"id": "depot", "location": locations[0]},
+            "vehicles": [],
+            "stops": stops,
+        }
+    )
+
+
+def _reference_matrix(input_data: Input) -> np.ndarray:
+    """Computes the haversine distance matrix in double precision."""
+    lats = np.radians(input_data.lats)
+    lons = np.radians(input_data.lons)
+    term1 = np.sin((lats[None, :] - lats[:, None]) / 2.0) ** 2
+    term2 = np.sin((lons[None, :] - lons[:, None]) / 2.0) ** 2
+    term2 *= np.cos(lats[:, None]) * np.cos(lats[None, :])
+    return 6371000 * 2 * np.arcsin(np.sqrt(term1 + term2))
+
+
+@pytest.mark.parametrize("lat", [0.0, 35.8, 60.0, 75.0])
+@pytest.mark.parametrize("extent", [0.5, FLOAT32_MAX_EXTENT, 10.0, 40.0, 180.0])
+def test_distance_matrix_precision(lat: float, extent: float):
+    input_data = _random_input(lat=lat, lon=-78.7, extent=extent)
+    matrix = distance_matrix(input_data)
+
+    assert matrix.dtype == (np.float32 if extent <= FLOAT32_MAX_EXTENT else np.float64)
+    assert np.array_equal(matrix, matrix.T)
+    assert np.all(np.diag(matrix) == 0)
+    error = np.abs(matrix.astype(np.float64) - _reference_matrix(input_data))
+    assert error.max() < TOLERANCE
+
+
+def test_distance_matrix_single_location():
+    input_data = _random_input(lat=35.8, lon=-78.7, extent=1.0, num_stops=0)
+    assert np.array_equal(distance_matrix(input_data), np.zeros((1, 1)))
+
+
+def test_distance_matrix_direct_input():
+    input_data = Input(
+        depot=Stop(id="depot", location=Location(lon=-78.74, lat=35.79)),
+        vehicles=[],
+        stops=[Stop(id="s1", location=Location(lon=-78.91, lat=35.72))],
+    )
+    assert input_data == Input.from_dict(
+        {
+            "depot": {"id": "depot", "location": {"lon": -78.74, "lat": 35.79}},
+            "vehicles": [],
+            "stops": [{"id": "s1", "location": {"lon": -78.91, "lat": 35.72}}],
+        }
+    )
+    matrix = distance_matrix(input_data)
+    assert matrix.shape == (2, 2)
+    assert abs(matrix[0, 1] - _reference_matrix(input_data)[0, 1]) < TOLERANCE